@@ -1,7 +1,14 @@
+import gzip
+import io
+import json
+import lzma
 import os
 import re
 import subprocess
+import tarfile
 import tempfile
+import threading
+import time
 import zipfile
 import rarfile
 import py7zr
@@ -10,6 +17,237 @@ from tkinter import filedialog, messagebox, ttk, scrolledtext
 from tkinterdnd2 import DND_FILES, TkinterDnD
 import webbrowser
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Output targets offered in the GUI, mapped to the archive file extension
+OUTPUT_FORMATS = {
+    "Folder": None,
+    "ZIP": ".zip",
+    "TAR": ".tar",
+    "TAR.GZ": ".tar.gz",
+    "TAR.XZ": ".tar.xz",
+    "TAR.ZST": ".tar.zst",
+}
+
+SINK_BUFFER_SIZE = 1024 * 1024
+
+
+class DirectorySink:
+    """Writes every output as a separate file in a folder."""
+
+    def __init__(self, export_dir, overwrite=True):
+        self.location = export_dir
+        self.overwrite = overwrite
+
+    def should_skip(self, name):
+        return not self.overwrite and os.path.exists(os.path.join(self.location, name))
+
+    def write(self, name, data):
+        with open(os.path.join(self.location, name), 'wb') as f:
+            f.write(data)
+
+    def close(self):
+        pass
+
+
+class ArchiveSink:
+    """Streams every output of an export into a single ZIP or tar archive.
+
+    Members are appended sequentially through one buffered file handle, so a
+    batch run creates one file on disk instead of one per subtitle. ZIP keeps
+    its own central directory; tar archives get an index.json member listing
+    every entry, written last.
+    """
+
+    def __init__(self, archive_path, fmt="ZIP", level=6):
+        self.location = archive_path
+        self.fmt = fmt
+        self.index = []
+        self._names = set()
+        self._compressor = None
+
+        if fmt == "TAR.ZST" and zstandard is None:
+            raise RuntimeError("TAR.ZST output requires the 'zstandard' package.")
+
+        self._fh = open(archive_path, 'wb', buffering=SINK_BUFFER_SIZE)
+        try:
+            if fmt == "ZIP":
+                level = min(max(level, 0), 9)
+                compression = zipfile.ZIP_DEFLATED if level > 0 else zipfile.ZIP_STORED
+                self._archive = zipfile.ZipFile(self._fh, 'w', compression=compression, compresslevel=level)
+                return
+
+            if fmt == "TAR.GZ":
+                self._compressor = gzip.GzipFile(fileobj=self._fh, mode='wb', compresslevel=min(max(level, 0), 9))
+            elif fmt == "TAR.XZ":
+                self._compressor = lzma.LZMAFile(self._fh, 'wb', preset=min(max(level, 0), 9))
+            elif fmt == "TAR.ZST":
+                cctx = zstandard.ZstdCompressor(level=min(max(level, 1), 22))
+                self._compressor = cctx.stream_writer(self._fh, closefd=False)
+            elif fmt != "TAR":
+                raise ValueError(f"Unsupported archive format: {fmt}")
+            self._archive = tarfile.open(fileobj=self._compressor or self._fh, mode='w|')
+        except Exception:
+            self._fh.close()
+            raise
+
+    def should_skip(self, name):
+        # Members of a streamed archive cannot be replaced once written
+        return name in self._names
+
+    def write(self, name, data):
+        if self.fmt == "ZIP":
+            self._archive.writestr(name, data)
+        else:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = int(time.time())
+            self._archive.addfile(info, io.BytesIO(data))
+        self._names.add(name)
+        self.index.append({"name": name, "size": len(data)})
+
+    def close(self):
+        try:
+            if self.fmt != "ZIP":
+                data = json.dumps({"files": self.index}, indent=2).encode('utf-8')
+                info = tarfile.TarInfo("index.json")
+                info.size = len(data)
+                info.mtime = int(time.time())
+                self._archive.addfile(info, io.BytesIO(data))
+            self._archive.close()
+            if self._compressor is not None:
+                self._compressor.close()
+        finally:
+            self._fh.close()
+
+
+def parse_timestamp(value):
+    """Convert an ffmpeg HH:MM:SS(.fraction) timestamp to seconds, or None if it cannot be parsed."""
+    match = re.match(r'(\d+):(\d+):(\d+(?:\.\d+)?)', value.strip())
+    if not match:
+        return None
+    return int(match.group(1)) * 3600 + int(match.group(2)) * 60 + float(match.group(3))
+
+
+def format_seconds(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+class ProgressTracker:
+    """Weighted progress, throughput and ETA across all ffmpeg calls of one export.
+
+    Each task is given as a (duration_seconds, size_bytes) pair, either of which
+    may be None. Tasks are weighted by source bytes when every task has a size,
+    otherwise by duration when every task has one, otherwise equally. Within a
+    task, progress comes from ffmpeg's -progress fields: out_time against the
+    source duration, or total_size against the source size.
+    """
+
+    def __init__(self, tasks):
+        self.tasks = list(tasks)
+        if self.tasks and all(size for _, size in self.tasks):
+            self.weights = [size for _, size in self.tasks]
+        elif self.tasks and all(duration for duration, _ in self.tasks):
+            self.weights = [duration for duration, _ in self.tasks]
+        else:
+            self.weights = [1] * len(self.tasks)
+        self.total_weight = sum(self.weights) or 1
+
+        self.start_time = time.monotonic()
+        self.task = -1
+        self.speed = None
+        self._active = False
+        self._done_weight = 0
+        self._passes = 1
+        self._pass = 0
+        self._pass_fraction = 0.0
+        self._done_bytes = 0
+        self._pass_bytes = 0
+
+    def start_task(self, passes=1):
+        """Begin the next task; a task may span several ffmpeg passes of equal share."""
+        self.task += 1
+        self._active = True
+        self._passes = passes
+        self._pass = 0
+        self._pass_fraction = 0.0
+        self._pass_bytes = 0
+
+    def next_pass(self):
+        self._done_bytes += self._pass_bytes
+        self._pass_bytes = 0
+        self._pass = min(self._pass + 1, self._passes - 1)
+        self._pass_fraction = 0.0
+
+    def add_bytes(self, count):
+        self._pass_bytes += count
+
+    def update(self, fields):
+        """Apply one block of key=value fields reported by ffmpeg -progress."""
+        duration, size = self.tasks[self.task]
+
+        # out_time_ms is reported in microseconds, same as out_time_us
+        out_time = fields.get('out_time_us') or fields.get('out_time_ms')
+        if out_time and out_time.lstrip('-').isdigit():
+            out_time = max(int(out_time), 0) / 1_000_000
+        else:
+            out_time = None
+
+        total_size = fields.get('total_size', '')
+        if total_size.isdigit():
+            self._pass_bytes = int(total_size)
+
+        speed = fields.get('speed', '').rstrip('x').strip()
+        try:
+            self.speed = float(speed)
+        except ValueError:
+            pass
+
+        if fields.get('progress') == 'end':
+            fraction = 1.0
+        elif duration and out_time is not None:
+            fraction = out_time / duration
+        elif size:
+            fraction = self._pass_bytes / size
+        else:
+            fraction = self._pass_fraction
+        self._pass_fraction = min(max(fraction, self._pass_fraction), 1.0)
+
+    def finish_task(self):
+        self._done_bytes += self._pass_bytes
+        self._pass_bytes = 0
+        self._done_weight += self.weights[self.task]
+        self._active = False
+        self._pass = 0
+        self._pass_fraction = 0.0
+
+    @property
+    def fraction(self):
+        current = 0
+        if self._active:
+            current = self.weights[self.task] * (self._pass + self._pass_fraction) / self._passes
+        return min((self._done_weight + current) / self.total_weight, 1.0)
+
+    def metrics(self):
+        elapsed = time.monotonic() - self.start_time
+        fraction = self.fraction
+        bytes_out = self._done_bytes + self._pass_bytes
+        return {
+            "task": self.task + 1,
+            "tasks": len(self.tasks),
+            "percent": round(fraction * 100, 1),
+            "elapsed": round(elapsed, 2),
+            "eta": round(elapsed * (1 - fraction) / fraction, 2) if fraction > 0 else None,
+            "speed": self.speed,
+            "bytes_out": bytes_out,
+            "throughput": round(bytes_out / elapsed) if elapsed > 0 else 0,
+        }
+
 
 class SubtitleExtractorApp:
     def __init__(self, root):
@@ -20,6 +258,8 @@ class SubtitleExtractorApp:
         self.mkv_file = None
         self.mkv_dir = None
         self.subtitle_info = []
+        self.media_duration = None
+        self.metrics = {}
 
         self.orig_vars = []
         self.vtt_vars = []
@@ -47,9 +287,27 @@ class SubtitleExtractorApp:
         self.overwrite_check = tk.Checkbutton(root, text="Force overwrite existing files", variable=self.overwrite_var)
         self.overwrite_check.pack(pady=5)
 
+        self.output_frame = tk.Frame(root)
+        self.output_frame.pack(pady=5)
+
+        tk.Label(self.output_frame, text="Output:").pack(side=tk.LEFT)
+        self.output_format_var = tk.StringVar(value="Folder")
+        self.output_format_combo = ttk.Combobox(self.output_frame, textvariable=self.output_format_var,
+                                                values=list(OUTPUT_FORMATS), state='readonly', width=10)
+        self.output_format_combo.pack(side=tk.LEFT, padx=5)
+
+        tk.Label(self.output_frame, text="Compression level:").pack(side=tk.LEFT)
+        self.compression_level_var = tk.IntVar(value=6)
+        self.compression_level_spin = tk.Spinbox(self.output_frame, from_=0, to=22, width=4,
+                                                 textvariable=self.compression_level_var)
+        self.compression_level_spin.pack(side=tk.LEFT, padx=5)
+
         self.progress = ttk.Progressbar(root, mode='determinate')
         self.progress.pack(fill='x', padx=10, pady=5)
 
+        self.status_label = tk.Label(root, text="", font=("Consolas", 10))
+        self.status_label.pack()
+
         self.export_button = tk.Button(root, text="Export Selected Subtitles", command=self.export_archived_subtitles, state=tk.DISABLED)
         self.export_button.pack(pady=5)
 
@@ -106,6 +364,9 @@ class SubtitleExtractorApp:
         lines = raw_output.replace('\r\n', '\n').split('\n')
         self.subtitle_info.clear()
 
+        duration_match = re.search(r'Duration:\s*(\d+:\d+:\d+(?:\.\d+)?)', raw_output)
+        self.media_duration = parse_timestamp(duration_match.group(1)) if duration_match else None
+
         i = 0
         while i < len(lines):
             line = lines[i].strip()
@@ -118,13 +379,22 @@ class SubtitleExtractorApp:
                 codec = match.group("codec")
                 desc_raw = match.group("desc").strip()
                 title = ""
+                duration = None
+                size = None
 
+                # Stream metadata: title, plus the DURATION/NUMBER_OF_BYTES statistics tags written by mkvmerge
                 j = i + 1
                 while j < len(lines) and lines[j].startswith("    "):
-                    title_match = re.search(r'title\s*:\s*(.*)', lines[j])
-                    if title_match:
-                        title = title_match.group(1).strip()
-                        break
+                    tag_match = re.match(r'\s*(?P<key>[\w\-]+)\s*:\s*(?P<value>.*)', lines[j])
+                    if tag_match:
+                        key = tag_match.group("key").split('-')[0].upper()
+                        value = tag_match.group("value").strip()
+                        if key == "TITLE" and not title:
+                            title = value
+                        elif key == "DURATION":
+                            duration = parse_timestamp(value)
+                        elif key == "NUMBER_OF_BYTES" and value.isdigit():
+                            size = int(value)
                     j += 1
 
                 full_label = f"{desc_raw} - {title}" if title else desc_raw or "Subtitle"
@@ -135,7 +405,9 @@ class SubtitleExtractorApp:
                     "lang": lang,
                     "codec": codec,
                     "desc": full_label,
-                    "safe_desc": safe_label
+                    "safe_desc": safe_label,
+                    "duration": duration or self.media_duration,
+                    "size": size
                 })
             i += 1
 
@@ -257,6 +529,106 @@ class SubtitleExtractorApp:
         if self.mkv_dir:
             os.startfile(self.mkv_dir)
 
+    def open_sink(self, basename, initialdir=None):
+        """Ask for the export target and return the matching output sink, or None if canceled."""
+        fmt = self.output_format_var.get()
+        archive_ext = OUTPUT_FORMATS.get(fmt)
+
+        if archive_ext is None:
+            export_dir = filedialog.askdirectory(title="Choose export folder", initialdir=initialdir)
+            if not export_dir:
+                self.log("[WARN] Export canceled - no folder selected.")
+                return None
+            return DirectorySink(export_dir, overwrite=self.overwrite_var.get())
+
+        archive_path = filedialog.asksaveasfilename(
+            title="Choose export archive",
+            initialdir=initialdir,
+            initialfile=f"{basename}{archive_ext}",
+            defaultextension=archive_ext,
+            filetypes=[(f"{fmt} archive", f"*{archive_ext}"), ("All files", "*.*")]
+        )
+        if not archive_path:
+            self.log("[WARN] Export canceled - no archive selected.")
+            return None
+
+        try:
+            level = int(self.compression_level_var.get())
+        except (tk.TclError, ValueError):
+            level = 6
+
+        try:
+            sink = ArchiveSink(archive_path, fmt=fmt, level=level)
+        except Exception as e:
+            self.log(f"[ERROR] Failed to create archive: {e}")
+            messagebox.showerror("Error", f"Failed to create archive:\n{e}")
+            return None
+        self.log(f"[INFO] Writing {fmt} archive (level {level}): {archive_path}")
+        return sink
+
+    def run_ffmpeg(self, cmd, input_data=None, tracker=None):
+        """Run an ffmpeg command that writes to pipe:1 and return its output bytes, or None on failure.
+
+        Subtitle data owns stdout, so -progress is sent to stderr and its
+        key=value blocks are parsed as they arrive to drive the tracker.
+        """
+        cmd = [cmd[0], '-nostats', '-progress', 'pipe:2'] + cmd[1:]
+        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE if input_data is not None else subprocess.DEVNULL,
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+        chunks = []
+        reader = threading.Thread(target=lambda: chunks.append(proc.stdout.read()), daemon=True)
+        reader.start()
+        if input_data is not None:
+            def feed():
+                try:
+                    proc.stdin.write(input_data)
+                    proc.stdin.close()
+                except OSError:
+                    pass
+            threading.Thread(target=feed, daemon=True).start()
+
+        messages = []
+        fields = {}
+        for raw_line in proc.stderr:
+            line = raw_line.decode('utf-8', errors='replace').strip()
+            match = re.match(r'^(\w+)=(.*)$', line)
+            if not match:
+                if line:
+                    messages.append(line)
+                continue
+            fields[match.group(1)] = match.group(2).strip()
+            if match.group(1) == 'progress':
+                if tracker is not None:
+                    tracker.update(fields)
+                    self.show_progress(tracker)
+                fields = {}
+
+        proc.wait()
+        reader.join()
+        if proc.returncode != 0:
+            self.log(f"[ERROR] ffmpeg exited with code {proc.returncode}:")
+            self.log("\n".join(messages))
+            return None
+        return b"".join(chunks)
+
+    def show_progress(self, tracker):
+        self.metrics = tracker.metrics()
+        self.progress['value'] = self.metrics["percent"]
+
+        status = f"{self.metrics['task']}/{self.metrics['tasks']}  {self.metrics['throughput'] / 1024:.1f} KiB/s"
+        if self.metrics["speed"] is not None:
+            status += f"  speed {self.metrics['speed']:g}x"
+        if self.metrics["eta"] is not None:
+            status += f"  ETA {format_seconds(self.metrics['eta'])}"
+        self.status_label.config(text=status)
+        self.root.update_idletasks()
+
+    def finish_progress_task(self, tracker):
+        tracker.finish_task()
+        self.show_progress(tracker)
+        self.log(f"[METRICS] {json.dumps(self.metrics)}")
+
     ##########################################################
     # This is used for exporting from ZIP or from ASS/SRT    #
     # Look at export_subtitles for exporting from MKV        #
@@ -265,62 +637,76 @@ class SubtitleExtractorApp:
         if self.mkv_file is not None:
             self.export_subtitles()
         else:
-            export_dir = filedialog.askdirectory(title="Choose export folder")
-            if not export_dir:
-                self.log("[WARN] Export canceled - no folder selected.")
-                return
-
             total_tasks = sum(var.get() for var in self.orig_vars + self.vtt_vars)
             if total_tasks == 0:
                 messagebox.showwarning("No subtitles selected", "Please select at least one subtitle to export.")
                 return
 
-            self.progress['value'] = 0
-            step = 100 / total_tasks
+            basename = "subtitles"
+            if self.archive_files:
+                basename = os.path.splitext(os.path.basename(self.archive_files[0]))[0]
+            sink = self.open_sink(basename)
+            if sink is None:
+                return
 
+            tasks = []
             for i, path in enumerate(self.archive_files):
-                filename = os.path.basename(path)
-                name, ext = os.path.splitext(filename)
-
-                if self.orig_vars[i].get():
-                    out_path = os.path.join(export_dir, filename)
-                    if os.path.exists(out_path) and not self.overwrite_var.get():
-                        self.log(f"[SKIP] {filename} exists.")
-                    else:
-                        self.log(f"[COPY] {filename}")
-                        with open(path, 'rb') as src, open(out_path, 'wb') as dst:
-                            dst.write(src.read())
-                    self.progress['value'] += step
-                    self.root.update_idletasks()
-
-                if self.vtt_vars[i].get():
-                    temp_srt = path
-                    if ext.lower() == ".ass":
-                        temp_srt = os.path.join(export_dir, f"__temp__{i}.srt")
-                        cmd = ["ffmpeg", "-y", "-i", f"{path}", temp_srt]
-                        self.log(f"[CONVERT] ASS -> SRT: {' '.join(cmd)}")
-                        subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-
-                    out_vtt = os.path.join(export_dir, f"{name}.vtt")
-                    cmd = ["ffmpeg", "-y", "-i", temp_srt, out_vtt]
-                    self.log(f"[CONVERT] SRT -> VTT: {' '.join(cmd)}")
-                    subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-
-                    self.progress['value'] += step
-                    self.root.update_idletasks()
+                size = os.path.getsize(path)
+                tasks += [(None, size)] * (self.orig_vars[i].get() + self.vtt_vars[i].get())
+            tracker = ProgressTracker(tasks)
+            self.progress['value'] = 0
+            self.status_label.config(text="")
+
+            try:
+                for i, path in enumerate(self.archive_files):
+                    filename = os.path.basename(path)
+                    name, ext = os.path.splitext(filename)
+
+                    if self.orig_vars[i].get():
+                        tracker.start_task()
+                        if sink.should_skip(filename):
+                            self.log(f"[SKIP] {filename} exists.")
+                        else:
+                            self.log(f"[COPY] {filename}")
+                            with open(path, 'rb') as src:
+                                data = src.read()
+                            sink.write(filename, data)
+                            tracker.add_bytes(len(data))
+                        self.finish_progress_task(tracker)
+
+                    if self.vtt_vars[i].get():
+                        is_ass = ext.lower() == ".ass"
+                        tracker.start_task(passes=2 if is_ass else 1)
+                        vtt_name = f"{name}.vtt"
+                        if sink.should_skip(vtt_name):
+                            self.log(f"[SKIP] {vtt_name} exists.")
+                        else:
+                            if is_ass:
+                                cmd = ["ffmpeg", "-y", "-i", path, "-f", "srt", "pipe:1"]
+                                self.log(f"[CONVERT] ASS -> SRT: {' '.join(cmd)}")
+                                srt_data = self.run_ffmpeg(cmd, tracker=tracker)
+                                tracker.next_pass()
+                                cmd = ["ffmpeg", "-y", "-f", "srt", "-i", "pipe:0", "-f", "webvtt", "pipe:1"]
+                            else:
+                                srt_data = None
+                                cmd = ["ffmpeg", "-y", "-i", path, "-f", "webvtt", "pipe:1"]
+
+                            if not is_ass or srt_data is not None:
+                                self.log(f"[CONVERT] SRT -> VTT: {' '.join(cmd)}")
+                                vtt_data = self.run_ffmpeg(cmd, input_data=srt_data, tracker=tracker)
+                                if vtt_data is not None:
+                                    sink.write(vtt_name, vtt_data)
+
+                        self.finish_progress_task(tracker)
+            finally:
+                sink.close()
 
             self.log("[DONE] Export complete.")
-            messagebox.showinfo("Export Complete", f"Subtitles exported to:\n{export_dir}")
+            messagebox.showinfo("Export Complete", f"Subtitles exported to:\n{sink.location}")
             self.progress['value'] = 100
 
     def export_subtitles(self):
-        export_dir = filedialog.askdirectory(title="Choose export folder", initialdir=self.mkv_dir)
-        if not export_dir:
-            self.log("[WARN] Export canceled - no folder selected.")
-            return
-
         basename = os.path.splitext(os.path.basename(self.mkv_file))[0]
-        overwrite = self.overwrite_var.get()
 
         # Count duplicates per language
         lang_count = {}
@@ -337,81 +723,88 @@ class SubtitleExtractorApp:
             messagebox.showwarning("No subtitles selected", "Please select at least one subtitle to export.")
             return
 
+        sink = self.open_sink(basename, initialdir=self.mkv_dir)
+        if sink is None:
+            return
+
+        # Originals are exported first, then the VTT conversions
+        tasks = [(sub['duration'], sub['size']) for i, sub in enumerate(self.subtitle_info) if self.orig_vars[i].get()]
+        tasks += [(sub['duration'], sub['size']) for i, sub in enumerate(self.subtitle_info) if self.vtt_vars[i].get()]
+        tracker = ProgressTracker(tasks)
         self.progress['value'] = 0
-        step = 100 / total_tasks
+        self.status_label.config(text="")
 
-        vtt_count = 0
-        for i, sub in enumerate(self.subtitle_info):
-            lang = sub['lang']
-            codec = sub['codec']
-            ext = "srt" if codec.lower() == "subrip" else "ass"
+        try:
+            for i, sub in enumerate(self.subtitle_info):
+                lang = sub['lang']
+                codec = sub['codec']
+                ext = "srt" if codec.lower() == "subrip" else "ass"
+
+                if self.orig_vars[i].get():
+                    # filename formatting
+                    if lang_count[lang] > 1:
+                        filename = f"{basename}.{lang}.{sub['safe_desc']}.{ext}"
+                    else:
+                        filename = f"{basename}.{lang}.{ext}"
+
+                    tracker.start_task()
+                    if sink.should_skip(filename):
+                        self.log(f"[SKIP] {filename} exists.")
+                    else:
+                        cmd = [
+                            'ffmpeg', '-y',
+                            '-i', self.mkv_file,
+                            '-map', sub["stream_id"],
+                            '-f', ext,
+                            'pipe:1'
+                        ]
+                        self.log(f"[EXPORT] Original: {' '.join(cmd)}")
+                        data = self.run_ffmpeg(cmd, tracker=tracker)
+                        if data is not None:
+                            sink.write(filename, data)
+                            orig_outputs.append(filename)
+                    self.finish_progress_task(tracker)
+
+                if self.vtt_vars[i].get():
+                    vtt_outputs.append(i)
 
-            if self.orig_vars[i].get():
-                # filename formatting
-                if lang_count[lang] > 1:
-                    filename = f"{basename}.{lang}.{sub['safe_desc']}.{ext}"
-                else:
-                    filename = f"{basename}.{lang}.{ext}"
-                output_path = os.path.join(export_dir, filename)
-
-                cmd = [
-                    'ffmpeg',
-                    '-y' if overwrite else '-n',
-                    '-i', self.mkv_file,
-                    '-map', sub["stream_id"],
-                    output_path
-                ]
-                self.log(f"[EXPORT] Original: {' '.join(cmd)}")
-                result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
-                self.log(result.stdout)
-                orig_outputs.append(output_path)
-                self.progress['value'] += step
-                self.root.update_idletasks()
-
-            if self.vtt_vars[i].get():
-                vtt_count += 1
-                vtt_outputs.append(i)
-
-        vtt_filenames = []
-        if vtt_outputs:
             for idx, i in enumerate(vtt_outputs):
                 sub = self.subtitle_info[i]
-                is_ass = sub["codec"].lower() == "ass"
-                temp_ext = "srt" if sub["codec"].lower() == "subrip" else "ass"
-                temp_file = os.path.join(export_dir, f"__temp__{i}.{temp_ext}")
-                temp_srt_file = os.path.join(export_dir, f"__temp__{i}.srt") if is_ass else temp_file
-        
+
                 vtt_name = f"{basename}.vtt" if len(vtt_outputs) == 1 else f"subtitle{idx + 1}.vtt"
-                vtt_path = os.path.join(export_dir, vtt_name)
-        
+                tracker.start_task(passes=2)
+                if sink.should_skip(vtt_name):
+                    self.log(f"[SKIP] {vtt_name} exists.")
+                    self.finish_progress_task(tracker)
+                    continue
+
                 # Step 1: Extract and convert to SRT directly from MKV stream
                 extract_to_srt_cmd = [
                     'ffmpeg', '-y',
-                    '-i', f'"{self.mkv_file}"',
+                    '-i', self.mkv_file,
                     '-map', sub["stream_id"],
                     '-c:s', 'srt',
-                    f'"{temp_srt_file}"'
+                    '-f', 'srt',
+                    'pipe:1'
                 ]
                 self.log(f"[EXPORT] Extracting and converting to SRT: {' '.join(extract_to_srt_cmd)}")
-                subprocess.run(' '.join(extract_to_srt_cmd), shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
-                
+                srt_data = self.run_ffmpeg(extract_to_srt_cmd, tracker=tracker)
+                tracker.next_pass()
+
                 # Step 2: Convert SRT to VTT
-                convert_to_vtt_cmd = ['ffmpeg', '-y', '-i', f'"{temp_srt_file}"', f'"{vtt_path}"']
-                self.log(f"[EXPORT] Converting to VTT: {' '.join(convert_to_vtt_cmd)}")
-                subprocess.run(' '.join(convert_to_vtt_cmd), shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
-
-                
-                # Cleanup
-                #if os.path.exists(temp_file):
-                    #os.remove(temp_file)
-                #if is_ass and os.path.exists(temp_srt_file):
-                #    os.remove(temp_srt_file)
-        
-                self.progress['value'] += step
-                self.root.update_idletasks()
-     
+                if srt_data is not None:
+                    convert_to_vtt_cmd = ['ffmpeg', '-y', '-f', 'srt', '-i', 'pipe:0', '-f', 'webvtt', 'pipe:1']
+                    self.log(f"[EXPORT] Converting to VTT: {' '.join(convert_to_vtt_cmd)}")
+                    vtt_data = self.run_ffmpeg(convert_to_vtt_cmd, input_data=srt_data, tracker=tracker)
+                    if vtt_data is not None:
+                        sink.write(vtt_name, vtt_data)
+
+                self.finish_progress_task(tracker)
+        finally:
+            sink.close()
+
         self.log("[DONE] Export complete.")
-        messagebox.showinfo("Export Complete", f"{len(orig_outputs)} original + {len(vtt_outputs)} VTT subtitles exported to:\n{export_dir}")
+        messagebox.showinfo("Export Complete", f"{len(orig_outputs)} original + {len(vtt_outputs)} VTT subtitles exported to:\n{sink.location}")
         self.progress['value'] = 100
 
 